@@ -1,6 +1,9 @@
+import asyncio
+import orjson
 from uuid import uuid4, UUID
 from typing import Dict
 from datetime import datetime
+from time import monotonic, perf_counter
 
 from app.core.logging import Logger
 logger = Logger(name="Chat")
@@ -12,12 +15,65 @@ from app.core.config import validate_token
 router = APIRouter(prefix="/chat", tags=["chat"])
 active_sessions: Dict[str, TutorOrchestrator] = {}
 
+# Sessions are not torn down per disconnect; a single sweeper task expires
+# idle ones in bulk so clients can reconnect and per-request cleanup cost
+# disappears from the hot path.
+SESSION_IDLE_TTL = 600
+SWEEP_INTERVAL = 60
+session_last_activity: Dict[str, float] = {}
+# Sessions with an open WebSocket are never swept, even if the student has
+# been silently reading for longer than the TTL; idle only starts counting
+# once the connection drops.
+connected_sessions: set = set()
+
+
+async def session_sweeper():
+    """Evict and close sessions idle for longer than SESSION_IDLE_TTL."""
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL)
+        cutoff = monotonic() - SESSION_IDLE_TTL
+        expired = [
+            sid for sid, ts in session_last_activity.items()
+            if ts < cutoff and sid not in connected_sessions
+        ]
+        for sid in expired:
+            session_last_activity.pop(sid, None)
+            orchestrator = active_sessions.pop(sid, None)
+            if orchestrator:
+                try:
+                    await orchestrator.close()
+                except Exception as e:
+                    logger.error(f"[!] Failed to close idle session {sid}: {e}")
+        if expired:
+            logger.info(f"[-] Swept {len(expired)} idle session(s)")
+
+# Token coalescing: flush buffered tokens once the buffer reaches this many
+# characters or this much time has passed since the last frame. Amortizes the
+# per-frame ASGI send cost without hurting perceived latency.
+FLUSH_SIZE = 512
+FLUSH_INTERVAL = 0.02
+
+# Static frames serialized once at import; the error path should not pay for
+# dict construction and serialization while the connection is already failing.
+INVALID_TOKEN_FRAME = orjson.dumps(
+    {"error": "Invalid or expired token.", "code": 6001}
+).decode()
+SESSION_READY_FRAME = orjson.dumps(
+    {"is_end": True, "message": "Session Setup Complete", "status_code": 6000}
+).decode()
+
+
+async def send_response_frame(websocket: WebSocket, response: str):
+    await websocket.send_text(orjson.dumps(
+        {"response": response, "response_type": type(response).__name__}
+    ).decode())
+
 
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """ WebSocket endpoint for real-time chat with the AI tutor."""
 
-    logger.info(f"[+] New WebSocket connection from {websocket.client.host} @ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info("[+] New WebSocket connection from %s @ %s", websocket.client.host, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
 
     # Extract query params
     student_id = websocket.query_params.get("student_id")
@@ -30,10 +86,7 @@ async def websocket_endpoint(websocket: WebSocket):
     textbook_id = UUID(textbook_id)
 
     if not validate_token(token):
-        await websocket.send_json({
-            "error": "Invalid or expired token.",
-            "code": 6001
-        })
+        await websocket.send_text(INVALID_TOKEN_FRAME)
         logger.error(f"[!] Invalid token.")
         await websocket.close(code=4001)
         return
@@ -46,7 +99,7 @@ async def websocket_endpoint(websocket: WebSocket):
             # Reuse existing session
             orchestrator = active_sessions[session_id]
             session_id = session_id
-            logger.info(f"[+] Reconnected to existing session {session_id}")
+            logger.info("[+] Reconnected to existing session %s", session_id)
         else:
             # Create new session with the generated session_id
             orchestrator, log = await TutorOrchestrator.create(
@@ -55,56 +108,77 @@ async def websocket_endpoint(websocket: WebSocket):
                 session_id=session_id
             )
             active_sessions[session_id] = orchestrator
-            logger.info(f"[+] New session {session_id}")
-        
-        await websocket.send_json({
-            "is_end": True,
-            "message": "Session Setup Complete",
-            "status_code": 6000
-        })
+            logger.info("[+] New session %s", session_id)
+        session_last_activity[session_id] = monotonic()
+        connected_sessions.add(session_id)
+
+        await websocket.send_text(SESSION_READY_FRAME)
     except Exception as e:
         logger.error(f"[!] Failed to initialize session {session_id}: {e}")
-        await websocket.send_json({
+        await websocket.send_text(orjson.dumps({
             "error": "Unable to initialize session.",
             "type": f"Exception: {e}",
             "code": 6001
-        })
+        }).decode())
         await websocket.close(code=4002)
         return
 
     try:
-        payload = {}
-        while True:
-            data: dict = await websocket.receive_json()
+        # iter_text terminates on client disconnect itself, so the receive
+        # path skips a per-message try/except unwind; orjson decodes the frame
+        # instead of stdlib json inside receive_json.
+        async for raw_message in websocket.iter_text():
+            data: dict = orjson.loads(raw_message)
             user_query = data.get("message")
             images = data.get("images", [])
-
-            request_start_time = datetime.now()
-            async for response in orchestrator.run(user_query, images):
-                if response:
-                    payload["response"] = response
-                    payload["response_type"] = type(response).__name__
-
-                    await websocket.send_json(payload)
+            session_last_activity[session_id] = monotonic()
+
+            request_start_time = perf_counter()
+            buffer = ""
+            last_flush = 0.0
+            stream = orchestrator.run(user_query, images)
+            try:
+                async for response in stream:
+                    if response:
+                        buffer += response
+                        now = monotonic()
+                        if len(buffer) >= FLUSH_SIZE or (now - last_flush) >= FLUSH_INTERVAL:
+                            await send_response_frame(websocket, buffer)
+                            buffer = ""
+                            last_flush = now
+            finally:
+                # If the client disconnected mid-answer, the send above raises
+                # and we close the generator chain immediately so the upstream
+                # LLM call stops consuming (and billing) tokens.
+                await stream.aclose()
+            if buffer:
+                await send_response_frame(websocket, buffer)
 
             payload = {
                 "is_end": True,
                 "session_id": str(session_id),
-                "duration" : (datetime.now() - request_start_time).total_seconds(),
+                "duration" : perf_counter() - request_start_time,
                 "message": "Message Complete successfully."
             }
             if debug:
                 payload["Log"] = log
 
-            await websocket.send_json(payload)
+            await websocket.send_text(orjson.dumps(payload).decode())
+
+        logger.info("[-] Session %s disconnected @ %s", session_id, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
 
     except WebSocketDisconnect:
-        logger.info(f"[-] Session {session_id} disconnected @ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        # Mid-send disconnects still surface here.
+        logger.info("[-] Session %s disconnected @ %s", session_id, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
 
     finally:
-        active_sessions.pop(session_id, None)
-        await orchestrator.close()
-        logger.info(f"[-] WebSocket connection closed for {websocket.client.host} @ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        # Leave the session in active_sessions so the client can reconnect;
+        # the sweeper closes it once SESSION_IDLE_TTL passes without activity,
+        # counted from this disconnect now that the connection is gone.
+        connected_sessions.discard(session_id)
+        if session_id in active_sessions:
+            session_last_activity[session_id] = monotonic()
+        logger.info("[-] WebSocket connection closed for %s @ %s", websocket.client.host, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
 
         await websocket.close()
 
@@ -4,7 +4,10 @@ Loads environment variables and provides centralized settings.
 """
 
 import os
+from collections import OrderedDict
+from hashlib import sha256
 from pathlib import Path
+from time import time
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
 
@@ -23,6 +26,10 @@ load_dotenv(ROOT_DIR / '.env')
 class Settings:
     """Application settings loaded from environment variables."""
 
+    # All values live on the class; empty slots keep instances from growing
+    # a per-instance __dict__ and guard against accidental runtime mutation.
+    __slots__ = ()
+
     SECRET_KEY: str = os.getenv("SECRET_KEY")
     
     # Database Configuration
@@ -34,12 +41,27 @@ class Settings:
         f"{BASE_MODEL_PATH}.textbook"
     ]
     
+    # Engine and sessionmaker are built once on first use and reused; building
+    # a fresh engine per session defeated SQLAlchemy's connection pool.
+    _async_session = None
+
     @asynccontextmanager
     async def get_session(self):
         try:
-            engine = create_async_engine(Settings.DB_URL, echo=True)
-            async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-            async with async_session() as session:
+            if Settings._async_session is None:
+                # Bounded pool with fast-fail timeouts: a slow database should
+                # surface as an error, not pile up connections past the limit.
+                engine = create_async_engine(
+                    Settings.DB_URL,
+                    echo=True,
+                    pool_size=10,
+                    max_overflow=20,
+                    pool_timeout=10,
+                    pool_recycle=1800,
+                    pool_pre_ping=True,
+                )
+                Settings._async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            async with Settings._async_session() as session:
                 yield session
         except Exception as e:
             raise RuntimeError(f"Database connection error. (SQLAlchemy Sessionmaker Error: {e})")
@@ -95,23 +117,63 @@ class Settings:
     CLASSIFICATION_TIMEOUT: int = int(os.environ.get('CLASSIFICATION_TIMEOUT', 200))
     VECTOR_SEARCH_TIMEOUT: int = int(os.environ.get('VECTOR_SEARCH_TIMEOUT', 80))
     
+    # CORS Configuration (comma-separated origins; "*" keeps the open default)
+    ALLOWED_ORIGINS: list = [origin.strip() for origin in os.environ.get('ALLOWED_ORIGINS', '*').split(',')]
+
     # Logging Configuration
     LOG_LEVEL: str = os.environ.get('LOG_LEVEL', 'INFO')
 
 
 settings = Settings()
 
+# Bound once for the per-connection token check rather than re-resolved
+# through the settings object on every call.
+_SECRET_KEY = settings.SECRET_KEY
+
+
+# Validated-token cache: clients reconnect with the same JWT many times per
+# token lifetime, so repeat connects skip the signature check. Entries are
+# keyed by a token digest (never the raw token) and expire with the token
+# itself, capped at a short TTL so revocation-by-expiry stays prompt.
+_TOKEN_CACHE: OrderedDict = OrderedDict()
+_TOKEN_CACHE_TTL = 30
+_TOKEN_CACHE_MAXSIZE = 10000
+
 
 def validate_token(token: str) -> bool:
     """Validate JWT token"""
+    # Structural prefilter: garbage tokens (wrong segment count) are rejected
+    # before any base64 or signature work runs.
+    if not token or token.count(".") != 2:
+        return False
+
+    now = time()
+    digest = sha256(token.encode()).digest()[:16]
+    expires_at = _TOKEN_CACHE.get(digest)
+    if expires_at is not None:
+        if now < expires_at:
+            return True
+        del _TOKEN_CACHE[digest]
+
     try:
         payload = jwt.decode(
             token,
-            settings.SECRET_KEY,
+            _SECRET_KEY,
             algorithms=["HS256"]
         )
-        return True if payload else False
     except ExpiredSignatureError:
         return False
     except InvalidTokenError:
         return False
+
+    if not payload:
+        return False
+
+    expires_at = now + _TOKEN_CACHE_TTL
+    token_exp = payload.get("exp")
+    if token_exp is not None:
+        expires_at = min(expires_at, token_exp)
+    _TOKEN_CACHE[digest] = expires_at
+    while len(_TOKEN_CACHE) > _TOKEN_CACHE_MAXSIZE:
+        _TOKEN_CACHE.popitem(last=False)
+    return True
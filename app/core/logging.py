@@ -1,5 +1,7 @@
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from time import time
 import os
 from zoneinfo import ZoneInfo
 
@@ -7,6 +9,15 @@ LOG_DIR = Path("logs")
 if not LOG_DIR.exists():
     LOG_DIR.mkdir(parents=True, exist_ok=True)
 
+IST = ZoneInfo("Asia/Kolkata")
+
+
+@lru_cache(maxsize=1)
+def _format_timestamp(second: int) -> str:
+    # Log timestamps have second precision, so the strftime allocation only
+    # needs to happen once per wall-clock second however many records land.
+    return datetime.fromtimestamp(second, IST).strftime("%Y-%m-%d %H:%M:%S")
+
 
 
 class Logger:
@@ -21,13 +32,34 @@ class Logger:
         "RESET": "\033[0m",
     }
 
+    LEVELS = {
+        "DEBUG": 10,
+        "INFO": 20,
+        "PERFORMANCE": 20,
+        "OUTPUT": 20,
+        "WARNING": 30,
+        "ERROR": 40,
+        "CRITICAL": 50,
+    }
+
 
     def __init__(self, name="Logger"):
         self.name = name
+        self.level = self.LEVELS.get(os.environ.get("LOG_LEVEL", "INFO").upper(), 20)
+
+
+    def isEnabledFor(self, level):
+        return self.LEVELS.get(level, 20) >= self.level
 
 
-    def _log(self, level, message, log_file=None):
-        timestamp = datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%Y-%m-%d %H:%M:%S")
+    def _log(self, level, message, log_file=None, args=()):
+        if not self.isEnabledFor(level):
+            return
+        if args:
+            # Lazy %-style formatting: callers pass args so the message is only
+            # built when the record is actually emitted.
+            message = message % args
+        timestamp = _format_timestamp(int(time()))
         colored_level = f"{self.COLORS.get(level, '')}{level:<11}{self.COLORS['RESET']}"
         full_msg = f"[{timestamp}] [{self.name}] {colored_level} {message}"
 
@@ -42,10 +74,10 @@ class Logger:
                 f.write(uncolored + "\n")
 
 
-    def info(self, message): self._log(level="INFO", message=message, log_file=Path(os.path.join(LOG_DIR, "operation.csv")))
-    def debug(self, message): self._log(level="DEBUG", message=message, log_file=Path(os.path.join(LOG_DIR, "operation.csv")))
-    def warning(self, message): self._log(level="WARNING", message=message, log_file=Path(os.path.join(LOG_DIR, "operation.csv")))
-    def error(self, message): self._log(level="ERROR", message=message, log_file=Path(os.path.join(LOG_DIR, "operation.csv")))
-    def critical(self, message): self._log(level="CRITICAL", message=message, log_file=Path(os.path.join(LOG_DIR, "operation.csv")))
-    def performance(self, message): self._log(level="PERFORMANCE", message=message, log_file=Path(os.path.join(LOG_DIR, "performance.csv")))
-    def output(self, message): self._log(level="OUTPUT", message=message, log_file=Path(os.path.join(LOG_DIR, "outputs.csv")))
+    def info(self, message, *args): self._log(level="INFO", message=message, log_file=Path(os.path.join(LOG_DIR, "operation.csv")), args=args)
+    def debug(self, message, *args): self._log(level="DEBUG", message=message, log_file=Path(os.path.join(LOG_DIR, "operation.csv")), args=args)
+    def warning(self, message, *args): self._log(level="WARNING", message=message, log_file=Path(os.path.join(LOG_DIR, "operation.csv")), args=args)
+    def error(self, message, *args): self._log(level="ERROR", message=message, log_file=Path(os.path.join(LOG_DIR, "operation.csv")), args=args)
+    def critical(self, message, *args): self._log(level="CRITICAL", message=message, log_file=Path(os.path.join(LOG_DIR, "operation.csv")), args=args)
+    def performance(self, message, *args): self._log(level="PERFORMANCE", message=message, log_file=Path(os.path.join(LOG_DIR, "performance.csv")), args=args)
+    def output(self, message, *args): self._log(level="OUTPUT", message=message, log_file=Path(os.path.join(LOG_DIR, "outputs.csv")), args=args)
@@ -1,6 +1,6 @@
-import json
+import orjson
 import regex
-from datetime import datetime
+from time import perf_counter
 from typing import Dict, Any, Optional
 
 from app.core.logging import Logger
@@ -11,6 +11,17 @@ from app.services.tools.llm import llm_client
 from app.services.tools.prompt import prompt_render
 
 
+# Compiled once at import: recursive pattern matching the first balanced
+# JSON object in the model's reply.
+JSON_OBJECT_RE = regex.compile(r"\{(?:[^{}]|(?R))*\}", regex.DOTALL)
+
+# Static part of the failure payload; only the reason varies per call.
+FAILURE_RESPONSE = {
+    "query_status": "error",
+    "message": "Unable to determine query safety. Please try again."
+}
+
+
 
 class JailbreakDetector(Agent):
     name: str = "jailbreak_detector"
@@ -22,9 +33,9 @@ class JailbreakDetector(Agent):
 
     async def run(self, query: Optional[str]) -> Dict[str, Any]:
         try:
-            start_time = datetime.now()
+            start_time = perf_counter()
 
-            history = self.get_from_context("history", [])[-4:]
+            history = self.context.get_history(limit=4)
 
             try:
                 # Prepare system prompt
@@ -61,15 +72,15 @@ class JailbreakDetector(Agent):
                 ):
                     response_text += chunk.get("content", "")
 
-                match = regex.search(r"\{(?:[^{}]|(?R))*\}", response_text, regex.DOTALL)
+                match = JSON_OBJECT_RE.search(response_text)
                 if not match:
                     return self._failure("Malformed response. JSON not found.")
 
-                metadata = json.loads(match.group(0))
+                metadata = orjson.loads(match.group(0))
                 if "query_status" not in metadata:
                     return self._failure("Missing 'query_status' in metadata.")
                 
-                logger.performance(f"Jailbreak Screeng Duration: {datetime.now() - start_time}")
+                logger.performance("Jailbreak Screeng Duration: %s", perf_counter() - start_time)
 
                 return metadata
             except Exception as e:
@@ -83,8 +94,4 @@ class JailbreakDetector(Agent):
 
 
     def _failure(self, message: str) -> Dict[str, Any]:
-        return {
-            "query_status": "error",
-            "reason": message,
-            "message": "Unable to determine query safety. Please try again."
-        }
+        return {**FAILURE_RESPONSE, "reason": message}
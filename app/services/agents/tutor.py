@@ -1,4 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
+from time import perf_counter
 from typing import Dict, Any, Optional, AsyncGenerator
 
 from app.core.logging import Logger
@@ -11,6 +13,13 @@ from app.services.tools.vector import vector_db
 # from app.utils.text import clean_math  # Optional: for math formatting
 
 
+@lru_cache(maxsize=1)
+def _current_date_str(today: date) -> str:
+    # Formatted once per day; also keeps the system-prompt variables stable
+    # so the prompt render cache hits for the rest of the day.
+    return today.strftime("%B %d, %Y")
+
+
 class TutorAgent(Agent):
     name: str = "tutor"
     description: str = "Answers student questions using contextual knowledge."
@@ -25,17 +34,19 @@ class TutorAgent(Agent):
         stream: bool = True
     ) -> AsyncGenerator[Dict[str, Any], None] | Dict[str, Any]:
         """Run the tutor agent to answer a student's question."""
-        start_time = datetime.now()
-        logger.info(f"TutorAgent Started at {start_time}")
-        logger.info(f"Query: {query}")
+        start_time = perf_counter()
+        logger.info("TutorAgent Started at %s", datetime.now())
+        logger.info("Query: %s", query)
 
         try:
             history = self.context.get_history(limit=4)
             context_chunks = self.context.get_rag_documents(limit=4)
             if not context_chunks:
                 retriever = vector_db
-                context_chunks = await retriever.run(query=query, top_k=4)
-            logger.info(f"Context chunks: {len(context_chunks)} retrieved.")
+                context_chunks = await retriever.run(
+                    query=query, namespace=self.context.textbook_code, top_k=4
+                )
+            logger.info("Context chunks: %s retrieved.", len(context_chunks))
 
             try:
                 # Prepare prompts
@@ -45,13 +56,13 @@ class TutorAgent(Agent):
                     "subject_name": self.context.subject_name,
                     "standard": self.context.standard,
                     "educational_board": self.context.educational_board,
-                    "current_date": datetime.now().strftime("%B %d, %Y")
+                    "current_date": _current_date_str(date.today())
                 })
                 user_prompt = prompt_tool.render_from_file("tutor/user.j2", variables={
                     "user_query": query,
                     "rag_documents": context_chunks
                 })
-                logger.info(f"Prompts rendered successfully.")
+                logger.info("Prompts rendered successfully.")
             except Exception as e:
                 logger.error(f"Error rendering prompts: {e}")
                 yield {
@@ -100,10 +111,9 @@ class TutorAgent(Agent):
                     "content": response_text
                 }
 
-            end_time = datetime.now()
-            logger.info(f"TutorAgent Finished at {end_time}")
+            logger.info("TutorAgent Finished at %s", datetime.now())
             self.context.add_to_history("assistant", response_text)
-            logger.performance(f"Duration of TutorAgent: {end_time - start_time}")
+            logger.performance("Duration of TutorAgent: %s", perf_counter() - start_time)
 
         except Exception as e:
             logger.error("TutorAgent error", exc_info=True)
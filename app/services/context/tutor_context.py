@@ -1,5 +1,6 @@
+import asyncio
 from datetime import timezone, datetime
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 # from sqlmodel import select
@@ -10,6 +11,8 @@ from app.core.logging import Logger
 logger = Logger(name="Tutor Context")
 
 from app.services.tools.llm import llm_client
+from app.services.tools.storage import storage_client
+from app.services.tools.vector import canonicalize, TTLCache
 from app.framework.context import BaseContext
 from app.core.config import settings
 from app.services.tools.tables.student import Student, StudentTokenUsage, ensure_student
@@ -25,73 +28,84 @@ from app.services.tools.tables.base_table import populate_base_fields
 
 
 
+VALID_SPEAKERS = frozenset({"user", "assistant"})
+
+# Textbook catalog rows (textbook, subject, board, standard) change rarely and
+# are shared across students, so new sessions on a hot textbook skip the four
+# catalog queries. Student rows are never cached: token counters must be fresh.
+_TEXTBOOK_CACHE = TTLCache(maxsize=256, ttl=300)
+
+
 class TutorContext(BaseContext):
     def __init__(self, project_name: str = "tutor"):
         super().__init__(project_name=project_name)
 
         self.rag_documents: List[str] = []
+        self._history_save_task: Optional[asyncio.Task] = None
+        self._history_dirty: bool = False
 
 
     async def initialize(self, student_id: UUID, textbook_id: UUID):
         self.student_id = student_id
         self.textbook_id = textbook_id
 
-        try:
-            self.student = await self._validate_student(student_id)
-        except Exception as e:
-            raise ValueError(f"Failed to validate student: (Tutor Context initialize Error: {e})")
-        
-        try:
-            self.textbook = await self._validate_textbook(textbook_id)
-        except Exception as e:
-            raise ValueError(f"Failed to validate textbook: (Tutor Context initialize Error: {e})")
+        # Both validators share one session, so context bootstrap costs a
+        # single connection setup instead of one per fetch.
+        async with settings.get_session() as session:
+            try:
+                self.student = await self._validate_student(session, student_id)
+            except Exception as e:
+                raise ValueError(f"Failed to validate student: (Tutor Context initialize Error: {e})")
+
+            try:
+                self.textbook = await self._validate_textbook(session, textbook_id)
+            except Exception as e:
+                raise ValueError(f"Failed to validate textbook: (Tutor Context initialize Error: {e})")
         
         self.log["success"].append(f"(tutor_context.py) initialized successfully for student {self.student.name} and textbook {self.textbook.name}.")
 
 
-    async def _validate_student(self, user_id: int):
+    async def _validate_student(self, session, user_id: int):
         today = datetime.now(timezone.utc).date()
+        try:
+            stmt = select(Student).where(Student.id == user_id)
+            result = await session.execute(stmt)
+            student = result.scalars().first()
+            logger.info(f"Student {student.name} found.")
+            self.log["success"].append(f"(TutorContext) Student {student.name} found.")
+        except Exception as e:
+            logger.error(f"Error Retrieving Student Details. ({e})")
+            self.log["error"].append(f"Error (_validate_student()): {e}")
+            raise ValueError(f"Invalid student ID for Student table. Connection denied. (_validate_student() Error: {e})")
 
-        async with settings.get_session() as session:
-            try:
-                stmt = select(Student).where(Student.id == user_id)
-                result = await session.execute(stmt)
-                student = result.scalars().first()
-                logger.info(f"Student {student.name} found.")
-                self.log["success"].append(f"(TutorContext) Student {student.name} found.")
-            except Exception as e:
-                logger.error(f"Error Retrieving Student Details. ({e})")
-                self.log["error"].append(f"Error (_validate_student()): {e}")
-                raise ValueError(f"Invalid student ID for Student table. Connection denied. (_validate_student() Error: {e})")
+        try:
+            stmt = select(StudentTokenUsage).where(
+                StudentTokenUsage.date_added == today,
+                StudentTokenUsage.student_id == student.id
+            )
+            result = await session.execute(stmt)
+            student_token_usage = result.scalars().first()
 
-            try:
-                stmt = select(StudentTokenUsage).where(
-                    StudentTokenUsage.date_added == today,
-                    StudentTokenUsage.student_id == student.id
+            if not student_token_usage:
+                student_token_usage = StudentTokenUsage(
+                    student_id=student.id,
+                    date_added=today
                 )
-                result = await session.execute(stmt)
-                student_token_usage = result.scalars().first()
-
-                if not student_token_usage:
-                    student_token_usage = StudentTokenUsage(
-                        student_id=student.id,
-                        date_added=today
-                    )
-                    logger.info(f"New StudentTokenUsage created for today.")
-                    self.log["success"].append(f"(TutorContext) New StudentTokenUsage created for today.")
-                else:
-                    logger.info(f"StudentTokenUsage for today found.")
-                    self.log["success"].append(f"(TutorContext) Student token usage for today found.")
-
-                    session.add(student_token_usage)
-                    await session.commit()
-                    await session.refresh(student_token_usage)
-                    logger.info(f"StudentTokenUsage refreshed from DB.")
-                    self.log["success"].append(f"(TutorContext) StudentTokenUsage committed to DB.")
-            except Exception as e:
-                logger.error(f"Error Retrieving StudentTokenUsage Details. ({e})")
-                self.log["error"].append(f"Error (_validate_student()): {e}")
-                raise ValueError(f"Invalid student ID for StudentTokenUsage table. Connection denied. (_validate_student() Error: {e})")
+                logger.info(f"New StudentTokenUsage created for today.")
+                self.log["success"].append(f"(TutorContext) New StudentTokenUsage created for today.")
+            else:
+                logger.info(f"StudentTokenUsage for today found.")
+                self.log["success"].append(f"(TutorContext) Student token usage for today found.")
+
+                session.add(student_token_usage)
+                await session.commit()
+                await session.refresh(student_token_usage)
+                logger.info(f"StudentTokenUsage refreshed from DB.")
+                self.log["success"].append(f"(TutorContext) StudentTokenUsage committed to DB.")
+        except Exception as e:
+            logger.error(f"Error Retrieving StudentTokenUsage Details. ({e})")
+            self.log["error"].append(f"Error (_validate_student()): {e}")
+            raise ValueError(f"Invalid student ID for StudentTokenUsage table. Connection denied. (_validate_student() Error: {e})")
 
         self.student = student
         self.student_name = student.name
@@ -104,67 +118,88 @@ class TutorContext(BaseContext):
         return student
 
 
-    async def _validate_textbook(self, textbook_id: int):
+    async def _validate_textbook(self, session, textbook_id: int):
+        cached = _TEXTBOOK_CACHE.get(textbook_id)
+        if cached is not None:
+            for attr, value in cached.items():
+                setattr(self, attr, value)
+            logger.info(f"Textbook {self.textbook.name} loaded from cache.")
+            self.log["success"].append(f"(TutorContext) Textbook {self.textbook.name} loaded from cache.")
+            return self.textbook
+
         try:
-            async with settings.get_session() as session:
-                try:
-                    # Get textbook with joined subject and board
-                    statement = select(TextBook).where(TextBook.id == textbook_id)
-                    result = await session.execute(statement)
-                    textbook = result.scalars().first()
-                    self.log["success"].append(f"(TutorContext) Textbook {textbook.name} found.")
-                    logger.info(f"Textbook {textbook.name} found.")
-                except Exception as e:
-                    self.log["error"].append(f"Error (_validate_textbook()): {e}")
-                    logger.error(f"Error Retrieving Textbook Details. ({e})")
-                    raise ValueError(f"Invalid textbook ID for Textbook table. Connection denied. (_validate_textbook() Error: {e})")
-
-                try:
-                    # Get subject
-                    subject_stmt = select(Subject).where(Subject.id == textbook.subject_id)
-                    result = await session.execute(subject_stmt)
-                    subject = result.scalars().first()
-                    self.subject_name = subject.name
-                    self.log["success"].append(f"(TutorContext) Subject {subject.name} found.")
-                    logger.info(f"Subject {subject.name} found.")
-                except Exception as e:
-                    self.log["error"].append(f"Error (_validate_textbook()): {e}")
-                    logger.error(f"Error Retrieving Subject Details. ({e})")
-                    raise ValueError(f"Invalid textbook ID for Subject table. Connection denied. (_validate_textbook() Error: {e})")
-
-                try:
-                    # Get educational board
-                    board_stmt = select(EducationalBoard).where(EducationalBoard.id == textbook.educational_board_id)
-                    result = await session.execute(board_stmt)
-                    board = result.scalars().first()
-                    self.educational_board = board.name
-                    self.log["success"].append(f"(TutorContext) Educational board {board.name} found.")
-                    logger.info(f"Educational board {board.name} found.")
-                except Exception as e:
-                    self.log["error"].append(f"Error (_validate_textbook()): {e}")
-                    logger.error(f"Error Retrieving Educational Board Details. ({e})")
-                    raise ValueError(f"Invalid textbook ID for EducationalBoard table. Connection denied. (_validate_textbook() Error: {e})")
-
-                try:
-                    # Get first standard (many-to-many)
-                    stmt = (
-                        select(Standard)
-                        .join(TextBookStandardLink, TextBookStandardLink.standard_id == Standard.id)
-                        .where(TextBookStandardLink.textbook_id == textbook.id)
-                    )
-                    result = await session.execute(stmt)
-                    standards = result.scalars().all()
-                    self.standard = standards[0].name if standards else None
-                    self.log["success"].append(f"(TutorContext) Standard {self.standard} found." if self.standard else "No standards found for textbook.")
-                    logger.info(f"Starndard {self.standard} found.")
-                except Exception as e:
-                    self.log["error"].append(f"Error (_validate_textbook()): {e}")
-                    logger.error(f"Error Retrieving Standard Details. ({e})")
-                    raise ValueError(f"Invalid textbook ID for Standard table. Connection denied. (_validate_textbook() Error: {e})")
+            try:
+                # Get textbook with joined subject and board
+                statement = select(TextBook).where(TextBook.id == textbook_id)
+                result = await session.execute(statement)
+                textbook = result.scalars().first()
+                self.log["success"].append(f"(TutorContext) Textbook {textbook.name} found.")
+                logger.info(f"Textbook {textbook.name} found.")
+            except Exception as e:
+                self.log["error"].append(f"Error (_validate_textbook()): {e}")
+                logger.error(f"Error Retrieving Textbook Details. ({e})")
+                raise ValueError(f"Invalid textbook ID for Textbook table. Connection denied. (_validate_textbook() Error: {e})")
+
+            try:
+                # Get subject
+                subject_stmt = select(Subject).where(Subject.id == textbook.subject_id)
+                result = await session.execute(subject_stmt)
+                subject = result.scalars().first()
+                self.subject_name = subject.name
+                self.subject_canonical = canonicalize(subject.name)
+                self.log["success"].append(f"(TutorContext) Subject {subject.name} found.")
+                logger.info(f"Subject {subject.name} found.")
+            except Exception as e:
+                self.log["error"].append(f"Error (_validate_textbook()): {e}")
+                logger.error(f"Error Retrieving Subject Details. ({e})")
+                raise ValueError(f"Invalid textbook ID for Subject table. Connection denied. (_validate_textbook() Error: {e})")
+
+            try:
+                # Get educational board
+                board_stmt = select(EducationalBoard).where(EducationalBoard.id == textbook.educational_board_id)
+                result = await session.execute(board_stmt)
+                board = result.scalars().first()
+                self.educational_board = board.name
+                self.educational_board_canonical = canonicalize(board.name)
+                self.log["success"].append(f"(TutorContext) Educational board {board.name} found.")
+                logger.info(f"Educational board {board.name} found.")
+            except Exception as e:
+                self.log["error"].append(f"Error (_validate_textbook()): {e}")
+                logger.error(f"Error Retrieving Educational Board Details. ({e})")
+                raise ValueError(f"Invalid textbook ID for EducationalBoard table. Connection denied. (_validate_textbook() Error: {e})")
+
+            try:
+                # Get first standard (many-to-many)
+                stmt = (
+                    select(Standard)
+                    .join(TextBookStandardLink, TextBookStandardLink.standard_id == Standard.id)
+                    .where(TextBookStandardLink.textbook_id == textbook.id)
+                )
+                result = await session.execute(stmt)
+                standards = result.scalars().all()
+                self.standard = standards[0].name if standards else None
+                self.standard_canonical = canonicalize(self.standard) if self.standard else None
+                self.log["success"].append(f"(TutorContext) Standard {self.standard} found." if self.standard else "No standards found for textbook.")
+                logger.info(f"Starndard {self.standard} found.")
+            except Exception as e:
+                self.log["error"].append(f"Error (_validate_textbook()): {e}")
+                logger.error(f"Error Retrieving Standard Details. ({e})")
+                raise ValueError(f"Invalid textbook ID for Standard table. Connection denied. (_validate_textbook() Error: {e})")
 
             self.textbook = textbook
             self.textbook_code = textbook.code
 
+            _TEXTBOOK_CACHE.set(textbook_id, {
+                "textbook": textbook,
+                "textbook_code": textbook.code,
+                "subject_name": self.subject_name,
+                "subject_canonical": self.subject_canonical,
+                "educational_board": self.educational_board,
+                "educational_board_canonical": self.educational_board_canonical,
+                "standard": self.standard,
+                "standard_canonical": self.standard_canonical,
+            })
+
             logger.info(f"Textbook {textbook.name} initialized successfully with subject {self.subject_name}, board {self.educational_board}, and standard {self.standard}.")
 
             return textbook
@@ -186,8 +221,8 @@ class TutorContext(BaseContext):
                 session.add(self.student)
                 session.add(self.student_token_usage)
                 await session.commit()
-                await session.refresh(self.student)
-                await session.refresh(self.student_token_usage)
+                # No refresh: the counters were just computed locally, so the
+                # two re-SELECT round trips added nothing.
                 self.log["success"].append(f"(TutorContext) Student token usage updated in DB: {self.student_token_usage.token_used} tokens used today.")
                 logger.info(f"Student token usage updated in DB: {self.student_token_usage.token_used} tokens used today.")
         except Exception as e:
@@ -225,7 +260,7 @@ class TutorContext(BaseContext):
         if not isinstance(document, str):
             raise ValueError("RAG document must be a string.")
         self.rag_documents.append(document)
-        logger.info(f"Added document to Context: {document[:50]}... (total: {len(self.rag_documents)})")
+        logger.info("Added document to Context: %s... (total: %s)", document[:50], len(self.rag_documents))
 
 
     def get_rag_documents(self, limit: int = 0) -> List[str]:
@@ -236,7 +271,7 @@ class TutorContext(BaseContext):
 
     # History
     def add_to_history(self, speaker: str, message: str):
-        if speaker not in ["user", "assistant"]:
+        if speaker not in VALID_SPEAKERS:
             raise ValueError("Speaker must be 'user' or 'assistant'.")
         super().add_to_history(role=speaker, content=message)
         
@@ -278,23 +313,33 @@ class TutorContext(BaseContext):
 
 
     def _save_history_to_s3(self):
-        """Save history to S3 bucket using session_id as the key."""
+        """Schedule a save of the history to S3, coalescing rapid updates.
+
+        S3 has no field-level updates, so each save re-serializes the whole
+        history blob. To avoid one upload per history entry (two per turn),
+        further saves requested while one is in flight collapse into a single
+        trailing upload of the latest state.
+        """
         try:
-            import asyncio
-            from app.services.tools.storage import storage_client
-            
-            # Use session_id as the key
-            key = f"history_{self.session_id}.json"
-            
-            # Run in a separate thread to avoid blocking
-            asyncio.create_task(asyncio.to_thread(storage_client.save, key, self.history))
-            self.logger.debug(f"[HISTORY] Saving history to S3 with key: {key}")
-        except ImportError:
-            self.logger.warning("[HISTORY] S3 storage client not available, history not saved")
+            if self._history_save_task and not self._history_save_task.done():
+                self._history_dirty = True
+                return
+            self._history_save_task = asyncio.create_task(self._flush_history_to_s3())
         except Exception as e:
             self.logger.error(f"[HISTORY] Failed to save history to S3: {e}")
 
 
+    async def _flush_history_to_s3(self):
+        key = f"history_{self.session_id}.json"
+        while True:
+            self._history_dirty = False
+            # Snapshot so the upload thread never races history mutations
+            await asyncio.to_thread(storage_client.save, key, list(self.history))
+            self.logger.debug(f"[HISTORY] Saved history to S3 with key: {key}")
+            if not self._history_dirty:
+                return
+
+
     async def close(self):
         """Context cleanup"""
 
@@ -1,18 +1,88 @@
 import asyncio
+import contextvars
+import sys
+from functools import lru_cache
 from uuid import UUID
-from datetime import datetime
+from time import perf_counter
 
 from app.core.logging import Logger
 logger = Logger(name="Tutor Orchestrator")
 
+from app.core.config import settings
+
 from app.services.context.tutor_context import TutorContext
 from app.services.agents.controller import JailbreakDetector
 from app.services.agents.tutor import TutorAgent
-from app.services.tools.vector import vector_db
+from app.services.tools.vector import vector_db, TTLCache
 from app.services.tools.image import vision_client
 from app.services.tools.storage import storage_client
 
 
+# Response cache for history-independent turns: the opening question of a
+# session streams the cached answer on repeats (page reloads, re-asks)
+# without touching the jailbreak screen or the LLM. Answers are rendered
+# under a prompt personalized with the student's name, so the key includes
+# the student id — entries are never shared across students. Follow-up turns
+# depend on conversation history and are never cached.
+response_cache = TTLCache(maxsize=512, ttl=300)
+
+# Agent tasks carry no contextvars, so they all share one empty context
+# instead of snapshotting the caller's context on every create_task.
+_EMPTY_CTX = contextvars.Context()
+
+
+def _spawn(coro) -> asyncio.Task:
+    return asyncio.get_running_loop().create_task(coro, context=_EMPTY_CTX)
+
+
+@lru_cache(maxsize=1024)
+def _normalize_query(query: str) -> str:
+    # Chat workloads repeat phrasings; repeats become one hash lookup and the
+    # interned result compares by pointer in the response-cache key.
+    return sys.intern(" ".join(query.lower().split()))
+
+
+
+class AdaptiveLimiter:
+    """TCP-congestion-style concurrency limiter for upstream LLM work.
+
+    Allowed concurrency grows by one after each clean completion and halves
+    when a request errors out, so throughput tracks what the upstream
+    endpoints can currently sustain instead of a fixed static cap.
+    """
+
+    def __init__(self, min_limit: int = 4, max_limit: int = 50):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = min_limit
+        self._active = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._cond:
+            while self._active >= self.limit:
+                await self._cond.wait()
+            self._active += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._cond:
+            self._active -= 1
+            if exc_type is None:
+                if self.limit < self.max_limit:
+                    self.limit += 1
+            elif not issubclass(exc_type, (GeneratorExit, asyncio.CancelledError)):
+                # Client disconnects surface as GeneratorExit/CancelledError
+                # through the streaming generator; they say nothing about
+                # upstream health, so only real errors trigger backoff.
+                self.limit = max(self.min_limit, self.limit // 2)
+            self._cond.notify_all()
+        return False
+
+
+llm_limiter = AdaptiveLimiter(min_limit=4, max_limit=settings.MAX_CONCURRENT_REQUESTS)
+
+
 
 # --------------------------------------------------------------------------------
 #        Tutor Orchestrator Start
@@ -100,38 +170,62 @@ class TutorOrchestrator:
 
     async def run(self, user_message: str, images: list = None):
 
-        start_time = datetime.now()
+        start_time = perf_counter()
         full_user_query = user_message
-        if images:
-            image_tasks = [asyncio.create_task(vision_client.run(image_base64=image)) for image in images]
-            image_descriptions = await asyncio.gather(*image_tasks)
-            # Combine image descriptions into a single string
-            image_description = " ".join(desc.get("text", "") for desc in image_descriptions)
-            full_user_query += f" {image_description}"
-
-        # Run jailbreak agent and RAG search in parallel
-        jailbreak_task = asyncio.create_task(self.jailbreak_agent.run(full_user_query))
-        vector_task = asyncio.create_task(self._fetch_relevant_docs(full_user_query))
-        jailbreak_result, _ = await asyncio.gather(jailbreak_task, vector_task)
-
-        full_response = ""
-        # Add user message to history
-        self.context.add_to_history("user", full_user_query)
-
-        if jailbreak_result.get("query_status") == "unsafe":
-            # If jailbreak detected, return warning
-            full_response = jailbreak_result.get("message", "Your query was flagged as unsafe.")
-            yield full_response
-            self.context.add_to_history("assistant", full_response)
-            return
-
-        # Run tutor agent with the result
-        async for chunk in self.tutor_agent.run(full_user_query):
-            response = chunk.get("content", "")
-            full_response += response
-            yield response
-
-        logger.performance(f"Tutor Total Duration: {datetime.now() - start_time}")
+
+        cache_key = None
+        # isinstance guard: clients may omit "message" entirely, and the
+        # baseline tolerated a None query; the cache path must not introduce
+        # a crash for it.
+        if isinstance(user_message, str) and not images and not self.context.history:
+            cache_key = (self.context.textbook_code, self.context.student_id, _normalize_query(user_message))
+            cached_response = response_cache.get(cache_key)
+            if cached_response is not None:
+                logger.info("Response cache hit. Skipping agents.")
+                self.context.add_to_history("user", full_user_query)
+                yield cached_response
+                self.context.add_to_history("assistant", cached_response)
+                logger.performance("Tutor Total Duration (cached): %s", perf_counter() - start_time)
+                return
+
+        async with llm_limiter:
+            if images:
+                image_tasks = [_spawn(vision_client.run(image_base64=image)) for image in images]
+                image_descriptions = await asyncio.gather(*image_tasks)
+                # Combine image descriptions into a single string
+                image_description = " ".join(desc.get("text", "") for desc in image_descriptions)
+                full_user_query += f" {image_description}"
+
+            # Run jailbreak agent and RAG search in parallel
+            jailbreak_task = _spawn(self.jailbreak_agent.run(full_user_query))
+            vector_task = _spawn(self._fetch_relevant_docs(full_user_query))
+            jailbreak_result = await jailbreak_task
+
+            full_response = ""
+            # Add user message to history
+            self.context.add_to_history("user", full_user_query)
+
+            if jailbreak_result.get("query_status") == "unsafe":
+                # Rejected queries never reach the tutor, so the in-flight RAG
+                # fetch is wasted work; cancel it instead of waiting it out.
+                vector_task.cancel()
+                full_response = jailbreak_result.get("message", "Your query was flagged as unsafe.")
+                yield full_response
+                self.context.add_to_history("assistant", full_response)
+                return
+
+            await vector_task
+
+            # Run tutor agent with the result
+            async for chunk in self.tutor_agent.run(full_user_query):
+                response = chunk.get("content", "")
+                full_response += response
+                yield response
+
+            if cache_key and full_response:
+                response_cache.set(cache_key, full_response)
+
+        logger.performance("Tutor Total Duration: %s", perf_counter() - start_time)
 
 
     async def _fetch_relevant_docs(self, query: str):
@@ -148,7 +242,7 @@ class TutorOrchestrator:
         for doc in results:
             self.context.add_rag_document(doc if isinstance(doc, str) else doc.get("text", ""))
 
-        logger.info(f"[VECTOR] Retrieved {len(results)} documents.")
+        logger.info("[VECTOR] Retrieved %s documents.", len(results))
 
 
     async def close(self): await self.context.close()
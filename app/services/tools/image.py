@@ -1,8 +1,10 @@
-from datetime import datetime
+from time import perf_counter
 from typing import AsyncGenerator, Dict, Any, Optional, List, Union
 import tiktoken
 
-from azure.ai.inference import ChatCompletionsClient
+# aio client: persistent HTTP session with warm connections, awaited calls
+# (see app/services/tools/llm.py).
+from azure.ai.inference.aio import ChatCompletionsClient
 from azure.core.credentials import AzureKeyCredential
 from azure.ai.inference.models import SystemMessage, UserMessage
 
@@ -122,7 +124,7 @@ class AzureVision(ViTProvider):
 
 
     async def run(self, image_base64, messages: List[dict]= []) -> AsyncGenerator[Dict, None]:
-        start_time = datetime.now()
+        start_time = perf_counter()
         if not image_base64:
             yield {
                 "error": "Image base64 data is required",
@@ -131,7 +133,7 @@ class AzureVision(ViTProvider):
             return
         formatted_messages = self.convert_messages(messages, image_base64=image_base64)
         yield self.non_stream(formatted_messages)
-        logger.performance(f"Image Processing Duration: {(datetime.now() - start_time).total_seconds()}")
+        logger.performance("Image Processing Duration: %s", perf_counter() - start_time)
         return
 
 
@@ -140,7 +142,7 @@ class AzureVision(ViTProvider):
         Perform a non-streamed call to the Azure multimodal vision model.
         """
         try:
-            response = self.client.complete(
+            response = await self.client.complete(
                 messages=formatted_messages,
                 model=self.model,
                 temperature=0.7,
@@ -151,7 +153,7 @@ class AzureVision(ViTProvider):
             total_tokens = await self._log_tokens(formatted_messages, content)
 
             if content:
-                logger.info(f"[AzureVision] Response: {content}")
+                logger.info("[AzureVision] Response: %s", content)
             else:
                 logger.warning("[AzureVision] Empty response")
             yield {
@@ -175,7 +177,7 @@ class AzureVision(ViTProvider):
             input_tokens = tokenizer.encode(prompt_text)
             output_tokens = tokenizer.encode(output)
             total_tokens = len(input_tokens) + len(output_tokens)
-            logger.info(f"[AzureViT] Token count: {total_tokens}")
+            logger.info("[AzureViT] Token count: %s", total_tokens)
             return total_tokens
         
         except Exception as e:
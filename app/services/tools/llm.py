@@ -1,8 +1,12 @@
 from datetime import datetime
+from time import perf_counter
 from typing import AsyncGenerator, Dict, Any, Optional, List, Union
 import tiktoken
 
-from azure.ai.inference import ChatCompletionsClient
+# The aio client keeps one persistent HTTP session per process, so repeated
+# calls reuse warm connections instead of paying TLS setup, and awaiting the
+# request leaves the event loop free for other sessions.
+from azure.ai.inference.aio import ChatCompletionsClient
 from azure.core.credentials import AzureKeyCredential
 from azure.ai.inference.models import SystemMessage, UserMessage, AssistantMessage
 
@@ -129,7 +133,7 @@ class AzureLLM(LLMProvider):
             raise ToolNotReadyError("Azure LLM client not initialized")
 
         messages = self._convert_messages(system_prompt, history, prompt)
-        logger.info(f"Calling Azure LLM (stream={stream}) with model {self.model}")
+        logger.info("Calling Azure LLM (stream=%s) with model %s", stream, self.model)
 
         if stream:
             async for chunk in self._stream_response(messages, prompt, temperature, max_tokens):
@@ -146,12 +150,12 @@ class AzureLLM(LLMProvider):
         max_tokens: int
     ) -> AsyncGenerator[Dict[str, Any], None]:
 
-        start_time = datetime.now()
-        logger.info(f"Generation Start@ {start_time}")
+        start_time = perf_counter()
+        logger.info("Generation Start@ %s", datetime.now())
         full_response = ""
 
         try:
-            response = self.client.complete(
+            response = await self.client.complete(
                 messages=messages,
                 model=self.model,
                 max_tokens=max_tokens,
@@ -159,7 +163,7 @@ class AzureLLM(LLMProvider):
                 stream=True
             )
 
-            for chunk in response:
+            async for chunk in response:
                 if chunk.choices:
                     delta = chunk.choices[0].delta
                     if hasattr(delta, 'content') and delta.content:
@@ -170,9 +174,8 @@ class AzureLLM(LLMProvider):
                             "status_code": 6000,
                         }
 
-            end_time = datetime.now()
-            logger.performance(f"Response Generation Duration: {(end_time - start_time).total_seconds()}")
-            logger.output(f"Input:\n{prompt}\n{messages}\n\nResponse:\n{full_response}")
+            logger.performance("Response Generation Duration: %s", perf_counter() - start_time)
+            logger.output("Input:\n%s\n%s\n\nResponse:\n%s", prompt, messages, full_response)
             total_tokens = await self._log_tokens(prompt, full_response)
 
             yield {
@@ -184,8 +187,7 @@ class AzureLLM(LLMProvider):
 
         except Exception as e:
             logger.error(f"Streaming error: {e}")
-            end_time = datetime.now()
-            logger.performance(f"Response Generation Duration: {(end_time - start_time).total_seconds()}")
+            logger.performance("Response Generation Duration: %s", perf_counter() - start_time)
 
             yield {
                 "is_end": True,
@@ -203,7 +205,7 @@ class AzureLLM(LLMProvider):
         max_tokens: int
     ) -> AsyncGenerator[Dict[str, Any], None]:
         try:
-            response = self.client.complete(
+            response = await self.client.complete(
                 messages=messages,
                 model=self.model,
                 max_tokens=max_tokens,
@@ -236,7 +238,7 @@ class AzureLLM(LLMProvider):
             input_tokens = tokenizer.encode(prompt)
             output_tokens = tokenizer.encode(output)
             total_tokens = len(input_tokens) + len(output_tokens)
-            logger.info(f"[AzureLLM] Token count: {total_tokens}")
+            logger.info("[AzureLLM] Token count: %s", total_tokens)
             return total_tokens
         
         except Exception as e:
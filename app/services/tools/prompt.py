@@ -1,5 +1,6 @@
+from collections import OrderedDict
 from jinja2 import Environment, FileSystemLoader, TemplateNotFound
-from typing import Dict
+from typing import Dict, Optional
 
 from app.framework.tools import Tool
 
@@ -7,6 +8,8 @@ class PromptBuilderTool(Tool):
     name = "prompt_builder"
     description = "Tool to render prompts from Jinja templates"
 
+    RENDER_CACHE_SIZE = 1024
+
     def __init__(self, template_dir: str = "app/prompts"):
         self.env = Environment(
             loader=FileSystemLoader(template_dir),
@@ -14,31 +17,50 @@ class PromptBuilderTool(Tool):
             lstrip_blocks=True
         )
         self.template_dir = template_dir
+        self._render_cache: OrderedDict = OrderedDict()
 
     def run():
         pass
     def confirm_setup(self):
         pass
 
-    def render_from_file(self, template_path: str, variables: Dict= {}) -> str:
+    def render_from_file(self, template_path: str, variables: Optional[Dict] = None) -> str:
         """
         Render a prompt from a Jinja template file, given relative path and variables.
+
+        Rendered output is memoized per (template_path, variables): templates are
+        rendered with a small set of recurring variable sets, so warm traffic
+        skips both template lookup and the Jinja render.
         """
+        variables = variables or {}
+        # Values may be unhashable (lists of RAG documents), so key on their
+        # string form but render with the originals.
+        cache_key = (template_path, tuple(sorted((k, str(v)) for k, v in variables.items())))
+        cached = self._render_cache.get(cache_key)
+        if cached is not None:
+            self._render_cache.move_to_end(cache_key)
+            return cached
+
         try:
             template = self.env.get_template(template_path)
-            return template.render(**(variables or {}))
+            rendered = template.render(**variables)
         except TemplateNotFound:
             raise ValueError(f"Template '{template_path}' not found in {self.template_dir}")
 
+        self._render_cache[cache_key] = rendered
+        while len(self._render_cache) > self.RENDER_CACHE_SIZE:
+            self._render_cache.popitem(last=False)
+        return rendered
+
     def render_from_string(self, template_str: str, variables: Dict) -> str:
         """
         Render a prompt from a raw Jinja template string and variables.
         """
         template = self.env.from_string(template_str)
         return template.render(**variables)
-    
+
     def __repr__(self):
         return f"<PromptBuilderTool dir={self.template_dir}>"
 
 
-prompt_render = PromptBuilderTool()
\ No newline at end of file
+prompt_render = PromptBuilderTool()
@@ -1,4 +1,4 @@
-import json
+import orjson
 import boto3
 from botocore.exceptions import ClientError
 from typing import Dict, Any, Optional, List
@@ -99,9 +99,9 @@ class S3StorageProvider(StorageProvider):
             raise ToolNotReadyError("S3 client not initialized")
 
         try:
-            # Convert data to JSON string
-            json_data = json.dumps(data)
-            
+            # Serialize with orjson; bytes go straight to put_object
+            json_data = orjson.dumps(data)
+
             # Upload to S3
             self.client.put_object(
                 Bucket=self.bucket_name,
@@ -109,7 +109,7 @@ class S3StorageProvider(StorageProvider):
                 Body=json_data,
                 ContentType='application/json'
             )
-            logger.info(f"[S3StorageProvider] Successfully saved data with key: {key}")
+            logger.info("[S3StorageProvider] Successfully saved data with key: %s", key)
             return True
         except ClientError as e:
             logger.error(f"[S3StorageProvider] Error saving data: {e}")
@@ -128,15 +128,14 @@ class S3StorageProvider(StorageProvider):
                 Key=key
             )
             
-            # Read and parse JSON data
-            json_data = response['Body'].read().decode('utf-8')
-            data = json.loads(json_data)
+            # Parse JSON bytes directly; orjson handles UTF-8 without a decode step
+            data = orjson.loads(response['Body'].read())
             
-            logger.info(f"[S3StorageProvider] Successfully loaded data with key: {key}")
+            logger.info("[S3StorageProvider] Successfully loaded data with key: %s", key)
             return data
         except ClientError as e:
             if e.response['Error']['Code'] == 'NoSuchKey':
-                logger.warning(f"[S3StorageProvider] No data found with key: {key}")
+                logger.warning("[S3StorageProvider] No data found with key: %s", key)
                 return None
             else:
                 logger.error(f"[S3StorageProvider] Error loading data: {e}")
@@ -154,7 +153,7 @@ class S3StorageProvider(StorageProvider):
                 Bucket=self.bucket_name,
                 Key=key
             )
-            logger.info(f"[S3StorageProvider] Successfully deleted data with key: {key}")
+            logger.info("[S3StorageProvider] Successfully deleted data with key: %s", key)
             return True
         except ClientError as e:
             logger.error(f"[S3StorageProvider] Error deleting data: {e}")
@@ -1,7 +1,8 @@
-from typing import Optional
-from datetime import datetime
+from typing import List, Optional
 from uuid import UUID, uuid4
 from sqlmodel import Field
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.tools.tables.base_table import BaseModel
 
@@ -22,3 +23,16 @@ class ChatSession(BaseModel, table=True):
     def __str__(self):
         return f"{self.id})"
 
+
+
+async def create_chat_sessions_bulk(session: AsyncSession, rows: List[dict]) -> None:
+    """Insert several chat sessions as one multi-VALUES statement.
+
+    Prefer this over per-row session.add() + commit() when sessions are
+    created in bursts: N rows cost a single round trip.
+    """
+    if not rows:
+        return
+    await session.execute(insert(ChatSession), rows)
+    await session.commit()
+
@@ -1,7 +1,8 @@
-from sqlmodel import SQLModel, Field, select
+from sqlmodel import SQLModel, Field
 from typing import Optional
 from datetime import date
 from uuid import UUID, uuid4
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -37,22 +38,31 @@ class StudentTokenUsage(SQLModel, table=True):
 
 
 
+# Process-wide cache of the anonymous student's id. The row is immutable
+# once created, so each worker only resolves it from the DB once.
+_ANON_ID: Optional[UUID] = None
+
+
 async def ensure_student(session: AsyncSession, student_id: Optional[UUID]) -> UUID:
+    global _ANON_ID
+
     if student_id:
         return student_id
 
-    # Lookup anonymous user/student by username/email/etc.
-    result = await session.execute(
-        select(Student).where(Student.name == "Anonymous")
-    )
-    student = result.scalar_one_or_none()
-
-    if student:
-        return student.id
+    if _ANON_ID is not None:
+        return _ANON_ID
 
-    # Else create one
-    new_student = Student(name="Anonymous")
-    session.add(new_student)
+    # Fetch-or-create the anonymous student in a single round trip. The
+    # no-op DO UPDATE makes RETURNING yield the id whether the row already
+    # existed or was just inserted. Relies on the unique index on
+    # students_student(name) for the Anonymous sentinel.
+    stmt = (
+        pg_insert(Student)
+        .values(id=uuid4(), name="Anonymous")
+        .on_conflict_do_update(index_elements=["name"], set_={"name": "Anonymous"})
+        .returning(Student.id)
+    )
+    result = await session.execute(stmt)
+    _ANON_ID = result.scalar_one()
     await session.commit()
-    await session.refresh(new_student)
-    return new_student.id
\ No newline at end of file
+    return _ANON_ID
\ No newline at end of file
@@ -1,6 +1,9 @@
+import asyncio
+
 from app.framework.tools import Tool
-from typing import Dict, Any, List
-from datetime import datetime
+from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from time import monotonic, perf_counter
 
 from pinecone import Pinecone
 
@@ -11,6 +14,48 @@ from app.core.config import settings
 
 
 
+# Metadata keys whose values are free text rather than catalog values.
+UNNORMALIZED_KEYS = ('text', 'source_file', 'processed_at')
+
+
+def canonicalize(value: str) -> str:
+    """Normalize a catalog value (subject, board, standard) to its index form.
+
+    Call this once when the value is loaded, not per query.
+    """
+    return value.replace(",", " ").replace(" ", "-").lower()
+
+
+
+
+class TTLCache:
+    """Small in-process TTL + LRU cache for repeated vector store lookups."""
+
+    def __init__(self, maxsize: int = 2048, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if monotonic() > expires_at:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._data[key] = (monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+
+
 class VectorTool(Tool):
     name: str
     is_ready: bool = False
@@ -45,6 +90,14 @@ class PineconeProvider(VectorTool):
         self.index = pc.Index(index_name)
         self.inference = pc.inference
 
+        # Second-level caches: identical queries within the TTL skip Pinecone
+        # entirely, and repeated query text reuses its embedding.
+        self._query_cache = TTLCache(maxsize=2048, ttl=300)
+        self._embedding_cache = TTLCache(maxsize=2048, ttl=300)
+        # Single-flight map: concurrent identical queries share one lookup
+        # instead of each missing the cache and hitting Pinecone.
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
 
     def confirm_setup(self):
         if self.index and self.inference:
@@ -55,28 +108,60 @@ class PineconeProvider(VectorTool):
             return False
 
 
-    async def run(self, query: str, namespace:str, filters: dict= {}, top_k: int = 3):
+    async def run(self, query: str, namespace: str, filters: Optional[dict] = None, top_k: int = 3):
         try:
-            self.pinecone_namespace = namespace
-            results = await self.query(query, filters, top_k)
-            return results
+            return await self.query(query, namespace, filters or {}, top_k)
         except Exception as e:
             return f"[VectorDB Error] {str(e)}"
 
 
-    async def query(self, query: str, filters: dict, top_k: int = 3) -> list[Dict]:
+    async def query(self, query: str, namespace: str, filters: dict, top_k: int = 3) -> list[Dict]:
         if not self.index:
             raise RuntimeError("Pinecone index not initialized.")
 
-        start_time = datetime.now()
-        embedding = self._embed_query(query)
+        cache_key = self._cache_key(query, namespace, filters, top_k)
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Vector cache hit for namespace %s", namespace)
+            return cached
+
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            logger.info("Vector query already in flight for namespace %s", namespace)
+            return await inflight
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            result = await self._query_index(query, namespace, filters, top_k, cache_key)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved for the no-waiter case
+            raise
+        finally:
+            # CancelledError bypasses the except clause above; resolve the
+            # future anyway so followers already awaiting it don't hang on a
+            # forever-pending future after the leader is cancelled.
+            if not future.done():
+                future.cancel()
+            self._inflight.pop(cache_key, None)
+
+
+    async def _query_index(self, query: str, namespace: str, filters: dict, top_k: int, cache_key: tuple) -> list[Dict]:
+        start_time = perf_counter()
+        # The Pinecone SDK is synchronous; run the embed and query off the
+        # event loop so other sessions keep streaming meanwhile.
+        embedding = await asyncio.to_thread(self._embed_query, query)
         filter_conditions = self._build_filters(filters)
 
-        logger.output(f"Metadata filters:\n{filter_conditions}\n")
+        logger.output("Metadata filters:\n%s\n", filter_conditions)
 
         try:
-            results = self.index.query(
-                namespace=self.pinecone_namespace,
+            results = await asyncio.to_thread(
+                self.index.query,
+                namespace=namespace,
                 vector=embedding,
                 filter=filter_conditions,
                 top_k=top_k,
@@ -87,22 +172,37 @@ class PineconeProvider(VectorTool):
             logger.error(f"Pinecone Querying Error: {e}")
             raise
 
-        logger.performance(f"Vector Store Response Duration: {(datetime.now() - start_time).total_seconds()}")
+        logger.performance("Vector Store Response Duration: %s", perf_counter() - start_time)
 
         if not results or not results['matches']:
             logger.warning("No matching documents found in index")
             return ["No matches found in the textbook. Reply with a brief surface level explanation."]
 
-        return self._format_results(results['matches'])
+        formatted = self._format_results(results['matches'])
+        self._query_cache.set(cache_key, formatted)
+        return formatted
+
+
+    def _cache_key(self, query: str, namespace: str, filters: dict, top_k: int) -> tuple:
+        frozen_filters = tuple(sorted(
+            (key, tuple(value) if isinstance(value, list) else value)
+            for key, value in filters.items()
+        ))
+        return (namespace, query, frozen_filters, top_k)
 
 
     def _embed_query(self, query: str) -> list[float]:
+        cached = self._embedding_cache.get(query)
+        if cached is not None:
+            return cached
+
         try:
             embedding = self.inference.embed(
                 model="multilingual-e5-large",
                 inputs=[query],
                 parameters={"input_type": "query"}
             )
+            self._embedding_cache.set(query, embedding[0].values)
             return embedding[0].values
         except Exception as e:
             logger.error(f"Error generating embedding: {e}")
@@ -110,12 +210,8 @@ class PineconeProvider(VectorTool):
 
 
     def _build_filters(self, filters: dict) -> dict:
-        for key, value in filters.items():
-            if key in ['text', 'source_file', 'processed_at']:
-                continue
-            if isinstance(value, str):
-                filters[key] = value.replace(",", " ").replace(" ", "-").lower()
-
+        # Values are expected to arrive already canonical (see canonicalize());
+        # this is pure dict assembly with no per-query string rewriting.
         return {
             "$or": [
                 {key: {"$in": value}} for key, value in filters.items() if isinstance(value, list)
@@ -128,17 +224,13 @@ class PineconeProvider(VectorTool):
     def _format_results(self, matches: list[dict]) -> list[Dict]:
         formatted = []
         for match in matches:
-            distance = match.get('score', 1.0)
-            metadata = match.get('metadata', {}).copy()
-            relevance = round(1 - distance, 4)
-            text = metadata.get('text', '')
-
+            metadata = match.get('metadata') or {}
             formatted.append({
-                "relevance": relevance,
-                "text": text,
+                "relevance": round(1 - match.get('score', 1.0), 4),
+                "text": metadata.get('text', ''),
                 "metadata": metadata
             })
-        logger.info(f"CONTEXT:\n{formatted}")
+        logger.info("CONTEXT:\n%s", formatted)
         return formatted
 
 
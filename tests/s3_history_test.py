@@ -1,6 +1,5 @@
 import asyncio
 import uuid
-from datetime import datetime
 import sys
 import os
 